@@ -1,10 +1,345 @@
 import json
+import os
 import warnings
+from collections import namedtuple
+from functools import lru_cache
+from itertools import repeat
+from importlib.resources import files
 
 import numpy as np
-import pkg_resources
 from sklearn.tree import DecisionTreeClassifier
 
+# traversal phases used by the tree writer's explicit stack
+_ENTER = 0
+_IF_END = 1
+_ELSE = 2
+_ELSE_END = 3
+
+# the language strings given to _emit_tree after the per-node strings, in this order
+_NUMBA_LANGUAGE_STRINGS = (
+    'empty', 'indentation', 'split_prefix', 'split_middle', 'split_suffix',
+    'leaf_prefix', 'leaf_suffix', 'if_end', 'else_', 'else_end',
+)
+
+# the language properties used while writing, 'if' and 'else' are renamed as they are keywords
+_Language = namedtuple('_Language', [
+    'indentation', 'if_', 'if_end', 'condition', 'then', 'else_', 'else_end',
+    'variable_operator', 'feature_name_prefix', 'feature_name_suffix',
+    'result_prefix', 'result_suffix', 'threshold_formatter',
+])
+
+
+def _emit_tree(children_left, children_right, max_depth, feature_string, threshold_string, class_string,
+               strings, offsets, out, write):
+    """Preorder traversal of the tree over raw arrays, written so that it
+    can be compiled with numba. Every line is copied as bytes into out.
+    ----------
+    children_left : ndarray of shape (n_nodes,)
+        The id of the left child of each node.
+    children_right : ndarray of shape (n_nodes,)
+        The id of the right child of each node.
+    max_depth : int
+        The depth of the deepest leaf in the tree.
+    feature_string, threshold_string, class_string : ndarray of shape (n_nodes,)
+        The id of the string holding each node's rendered feature name,
+        threshold and class.
+    strings : ndarray of uint8
+        Every string the output is made of, encoded back to back, starting
+        with the language strings in _NUMBA_LANGUAGE_STRINGS order.
+    offsets : ndarray of shape (n_strings + 1,)
+        The start of each string in strings.
+    out : ndarray of uint8
+        The output buffer, only written to if write is True.
+    write : bool
+        If False, only the length of the output is computed.
+
+    Returns
+    -------
+    pos : int
+         The number of bytes in the output.
+    """
+
+    # ids of the language strings, following _NUMBA_LANGUAGE_STRINGS
+    empty = 0
+    indentation = 1
+    split_prefix = 2
+    split_middle = 3
+    split_suffix = 4
+    leaf_prefix = 5
+    leaf_suffix = 6
+    if_end = 7
+    else_ = 8
+    else_end = 9
+
+    # every ancestor of the current node holds at most four pending entries
+    stack_node = np.empty(4 * max_depth + 1, np.int64)
+    stack_depth = np.empty(4 * max_depth + 1, np.int64)
+    stack_phase = np.empty(4 * max_depth + 1, np.int64)
+    stack_node[0] = 0
+    stack_depth[0] = 0
+    stack_phase[0] = _ENTER
+    top = 1
+
+    # the indentation repeated for every level, so each line's indentation is one contiguous copy
+    n_indentation = offsets[indentation + 1] - offsets[indentation]
+    indentation_run = np.empty(n_indentation * (max_depth + 1), np.uint8)
+    for i in range(max_depth + 1):
+        for j in range(n_indentation):
+            indentation_run[i * n_indentation + j] = strings[offsets[indentation] + j]
+
+    pos = 0
+
+    while top > 0:
+        top -= 1
+        node = stack_node[top]
+        depth = stack_depth[top]
+        phase = stack_phase[top]
+
+        # every line is made of up to five strings, padded with the empty one
+        if phase == _ENTER:
+            # leaves have both children set to the same id (-1)
+            left = children_left[node]
+            if left == children_right[node]:
+                pieces = (leaf_prefix, class_string[node], leaf_suffix, empty, empty)
+            else:
+                pieces = (split_prefix, feature_string[node], split_middle, threshold_string[node], split_suffix)
+
+                # pushed in reverse so that the left subtree is written first,
+                # followed by if_end, else, the right subtree and else_end
+                for next_node, next_depth, next_phase in (
+                        (node, depth, _ELSE_END),
+                        (children_right[node], depth + 1, _ENTER),
+                        (node, depth, _ELSE),
+                        (node, depth, _IF_END),
+                        (left, depth + 1, _ENTER)):
+                    stack_node[top] = next_node
+                    stack_depth[top] = next_depth
+                    stack_phase[top] = next_phase
+                    top += 1
+        elif phase == _IF_END:
+            if offsets[if_end + 1] == offsets[if_end]:
+                continue
+            pieces = (if_end, empty, empty, empty, empty)
+        elif phase == _ELSE:
+            pieces = (else_, empty, empty, empty, empty)
+        else:
+            if offsets[else_end + 1] == offsets[else_end]:
+                continue
+            pieces = (else_end, empty, empty, empty, empty)
+
+        # indentation, then the line itself, then a newline
+        length = depth * n_indentation
+        if write:
+            out[pos:pos + length] = indentation_run[:length]
+        pos += length
+
+        for piece in pieces:
+            start = offsets[piece]
+            length = offsets[piece + 1] - start
+            if write:
+                for j in range(length):
+                    out[pos + j] = strings[start + j]
+            pos += length
+
+        if write:
+            out[pos] = 10
+        pos += 1
+
+    return pos
+
+
+@lru_cache(maxsize=1)
+def _get_emit_tree_jit():
+    """Compile _emit_tree with numba. numba is imported here rather than
+    at module level, so importing johnny_appleseed stays fast for anyone
+    who never passes use_numba=True.
+    ----------
+
+    Returns
+    -------
+    emit_tree : function or None
+         The compiled _emit_tree, None if numba is not installed.
+    """
+
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    return njit(cache=True)(_emit_tree)
+
+
+def _encode_strings(strings):
+    """Encode strings back to back as UTF-8.
+    ----------
+    strings : list of strings
+        The strings to encode.
+
+    Returns
+    -------
+    data : ndarray of uint8
+         The encoded strings.
+    offsets : ndarray of shape (len(strings) + 1,)
+         The start of each string in data.
+    """
+
+    data = ''.join(strings).encode('utf-8')
+
+    # character counts only match byte counts for ASCII, otherwise each string is encoded
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+    if len(data) != lengths.sum():
+        lengths = np.fromiter((len(string.encode('utf-8')) for string in strings), dtype=np.int64,
+                              count=len(strings))
+
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    return np.frombuffer(data, dtype=np.uint8), offsets
+
+
+def _language_from_dict(language_dict):
+    """Convert a language dictionary to a _Language tuple.
+    ----------
+    language_dict : dictionary
+        The dictionary containing properties of the desired language.
+
+    Returns
+    -------
+    language : _Language
+         The properties of the desired language.
+    """
+
+    language = _Language(**{field: language_dict[field.rstrip('_')] for field in _Language._fields})
+
+    # checked before anything is written, so a bad property can't leave an output file half-written
+    for field, value in zip(_Language._fields, language):
+        if not isinstance(value, str):
+            raise TypeError('language property \'' + field.rstrip('_') + '\' is not a string.')
+
+    return language
+
+
+@lru_cache(maxsize=32)
+def _compile_tree_writer(language):
+    """Generate a tree writer specialized to a language. The language
+    properties are inlined as constants and empty if_end/else_end lines
+    are left out of the generated code entirely. Writers are cached per
+    language, so each one is only generated once.
+    ----------
+    language : _Language
+        The properties of the desired language.
+
+    Returns
+    -------
+    tree_writer : function
+         Performs a preorder traversal of the tree with an explicit
+         stack, so deep trees do not hit the recursion limit, appending
+         the exported chunks to a list.
+    """
+
+    src = [
+        'def tree_writer(buf, rendered_feature, rendered_threshold, rendered_class,',
+        '                children_left, children_right, indents, node, indentation_count):',
+        '    append = buf.append',
+        # each entry is (node, indentation level, phase)
+        '    stack = [(node, indentation_count, %r)]' % _ENTER,
+        '    push = stack.append',
+        '    pop = stack.pop',
+        '    while stack:',
+        '        node, indentation_count, phase = pop()',
+        '        indent = indents[indentation_count]',
+        '        if phase == %r:' % _ENTER,
+        '            append(indent)',
+        # leaves have both children set to the same id (-1)
+        '            left = children_left[node]',
+        '            if left == children_right[node]:',
+        '                append(%r)' % language.result_prefix,
+        '                append(rendered_class[node])',
+        '                append(%r)' % (language.result_suffix + '\n'),
+        '            else:',
+        '                append(%r)' % (language.if_ + language.variable_operator + language.feature_name_prefix),
+        '                append(rendered_feature[node])',
+        '                append(%r)' % (language.feature_name_suffix + language.condition),
+        '                append(rendered_threshold[node])',
+        '                append(%r)' % (language.then + '\n'),
+        # pushed in reverse so that the left subtree is written first,
+        # followed by if_end, else, the right subtree and else_end
+    ]
+    if language.else_end != '':
+        src.append('                push((node, indentation_count, %r))' % _ELSE_END)
+    src += [
+        '                push((children_right[node], indentation_count + 1, %r))' % _ENTER,
+        '                push((node, indentation_count, %r))' % _ELSE,
+    ]
+    if language.if_end != '':
+        src.append('                push((node, indentation_count, %r))' % _IF_END)
+    src += [
+        '                push((left, indentation_count + 1, %r))' % _ENTER,
+        '        elif phase == %r:' % _ELSE,
+        '            append(indent)',
+        '            append(%r)' % (language.else_ + '\n'),
+    ]
+    if language.if_end != '':
+        src += [
+            '        elif phase == %r:' % _IF_END,
+            '            append(indent)',
+            '            append(%r)' % (language.if_end + '\n'),
+        ]
+    if language.else_end != '':
+        src += [
+            '        elif phase == %r:' % _ELSE_END,
+            '            append(indent)',
+            '            append(%r)' % (language.else_end + '\n'),
+        ]
+
+    namespace = {}
+    exec(compile('\n'.join(src), '<tree_writer>', 'exec'), namespace)
+
+    return namespace['tree_writer']
+
+
+@lru_cache(maxsize=1)
+def _load_language_dicts():
+    """Read and parse language_dicts.dat, once per process.
+    ----------
+
+    Returns
+    -------
+    language_dicts : dictionary
+         The presets of every language found in language_dicts.dat.
+    """
+
+    # reading the data from the file
+    data = files('johnny_appleseed').joinpath('data/language_dicts.dat').read_text(encoding='utf-8')
+
+    # reconstructing the data as a dictionary of dictionaries
+    return json.loads(data)
+
+
+@lru_cache(maxsize=None)
+def _get_language_dict(language):
+    """Retrieve language properties from the cached presets.
+    ----------
+    language : string
+        The language whose properties will be retrieved.
+
+    Returns
+    -------
+    language_dict : dictionary
+         The dictionary containing properties of the desired language,
+         empty if the language has no preset.
+    """
+
+    language_dict = {}
+
+    # finding only the dictionary of the language we want
+    for l in _load_language_dicts()['languages']:
+        if l['name'] == language:
+            language_dict = l['properties']
+
+    # language not found
+    return language_dict
+
 
 class TreeExporter():
     """Tool for exporting scikit-learn Decision Tree Classifiers
@@ -22,9 +357,15 @@ class TreeExporter():
         if not isinstance(Tree, DecisionTreeClassifier):
             raise TypeError('Input is not a scikit-learn DecisionTreeClassifier() object.')
 
+        # the classifier itself, used by the native and fil exports
+        self._sklearn_tree = Tree
+
         # number of nodes that comprise the classifier
         self.n_nodes = Tree.tree_.node_count
 
+        # depth of the deepest leaf in the classifier
+        self.max_depth = Tree.tree_.max_depth
+
         # id of left children of each node
         self.children_left = Tree.tree_.children_left
 
@@ -46,17 +387,29 @@ class TreeExporter():
             warnings.warn('tree was not fitted with feature names - using numbers instead', RuntimeWarning)
             self.feature_names = list(range(Tree.n_features_in_))
 
+        # stored as an object array so it can be indexed by the whole features array at once
+        self.feature_names = np.asarray(self.feature_names, dtype=object)
+
         # leaf status for each node in classifier 1 if leaf 0 if subroot
-        self.is_leaf = [1 if self.children_left[node] == self.children_right[node] else 0 for node in range(self.n_nodes)]
+        self.is_leaf = (self.children_left == self.children_right).astype(np.uint8)
 
         # each class seen by the classifier in the fitting phase
-        self.classes = [Tree.classes_[np.argmax(Tree.tree_.value[i])] for i in range(self.n_nodes)]
+        # tree_.value has shape (n_nodes, n_outputs, n_classes), reduced over classes for the single output
+        self._class_ids = Tree.tree_.value.argmax(axis=-1)[:, 0]
+        self.classes = Tree.classes_[self._class_ids]
+
+        # plain Python objects, so class_map lookups and str() don't go through numpy scalars
+        self.classes = self.classes.tolist()
         
         # the exported tree stored as a string
         self.exported_tree = ''
 
+        # chunks of the exported tree, joined once the traversal is done
+        self._buf = []
+
 
-    def __writer(self, language_dict, feature_map, class_map, output_file_name=''):
+    def __writer(self, language_dict, feature_map, class_map, output_file_name='', use_numba=False,
+                 return_string=True):
         """The main writer for the Decision Tree Classifier code.
         ----------
         language_dict : dictionary
@@ -72,6 +425,12 @@ class TreeExporter():
             If the file doesn't exist already, it will be created. If the
             file already exists, it will be overwritten. If a file name
             is not specified, the tree will not be exported to a file.
+        use_numba : bool, optional
+            If True and numba is installed, the traversal is compiled
+            with numba.
+        return_string : bool, optional
+            If False, the chunks are only written to the output file and
+            self.exported_tree is left empty.
 
         Returns
         -------
@@ -79,128 +438,242 @@ class TreeExporter():
              The exported tree stored as a string.
         """
         
+        # attribute access on a fixed tuple instead of dictionary lookups while writing
+        language = _language_from_dict(language_dict)
+
+        # strings that only depend on the node, rendered once up front
+        rendered = self.__render_nodes(language, feature_map, class_map)
+
+        if use_numba and _get_emit_tree_jit() is None:
+            warnings.warn('numba is not installed - using the pure Python writer instead', RuntimeWarning)
+            use_numba = False
+
         # the tree itself
-        self.__tree_writer(language_dict, feature_map, class_map)
-        
+        self._buf = []
+        if use_numba:
+            self.__numba_tree_writer(language, *rendered)
+        else:
+            self.__tree_writer(language, *rendered)
+
         if output_file_name != '':
-            # file specified, export to said file
-            with open(output_file_name, 'w') as file:
-                file.write(self.exported_tree)
+            # file specified, export the chunks straight to said file
+            with open(output_file_name, 'w', buffering=1 << 20) as file:
+                file.writelines(self._buf)
+
+        if return_string:
+            self.exported_tree = ''.join(self._buf)
+
+        # the chunks are no longer needed
+        self._buf = []
 
         return self.exported_tree
-      
-    def __writer_leaf(self, language_dict, class_map, node):
-        """Writer for a decision tree leaf node.
+
+    def __render_nodes(self, language, feature_map, class_map):
+        """Renders every feature name and class, and the threshold of
+        every node, ahead of the traversal, so the writers only append
+        prebuilt strings.
         ----------
-        language_dict : dictionary
-            The dictionary containing properties of the desired language.
+        language : _Language
+            The properties of the desired language.
+        feature_map : dictionary
+            A dictionary that maps the feature names found in the tree
+            to the desired feature names in the exported language.
         class_map : dictionary
             A dictionary that maps the class names found in the tree
             to the desired class names in the exported language.
-        node : int
-            The current node to evaluate.
 
         Returns
         -------
-        Nothing
+        rendered_feature_names : list of strings of shape (n_features,)
+             The name of every feature.
+        rendered_threshold : list of strings of shape (n_nodes,)
+             The threshold of every node.
+        rendered_classes : list of strings of shape (n_classes,)
+             The name of every class.
         """
-        
-        self.exported_tree += language_dict['result_prefix']
-        if self.classes[node] in class_map:
-            # if the class name is found in the class map, use it instead
-            self.exported_tree += str(class_map[self.classes[node]])
-        else:
-            # otherwise, just use the default class name found in the tree
-            self.exported_tree += str(self.classes[node])
-        self.exported_tree += language_dict['result_suffix']
-        self.exported_tree += '\n'
-        
-    def __writer_split(self, language_dict, feature_map, node):
-        """Writer for a decision tree split node.
+
+        # mapped names are used when found in the maps, otherwise the names found in the tree
+        rendered_feature_names = [feature_map.get(name, name) for name in self.feature_names.tolist()]
+        rendered_classes = [str(class_map.get(c, c)) for c in self._sklearn_tree.classes_.tolist()]
+
+        # checked before anything is written, so a bad name can't leave an output file half-written
+        for feature in np.unique(self.features[self.features >= 0]).tolist():
+            if not isinstance(rendered_feature_names[feature], str):
+                raise TypeError('feature ' + str(self.feature_names[feature]) + ' is not a string - '
+                                'map it to a name with feature_map.')
+
+        # .tolist() gives plain floats, so float.__format__ can be mapped over them directly,
+        # skipping the type dispatch of the format() builtin
+        rendered_threshold = list(map(float.__format__, self.thresholds.tolist(),
+                                      repeat(language.threshold_formatter, self.n_nodes)))
+
+        return rendered_feature_names, rendered_threshold, rendered_classes
+      
+    def __tree_writer(self, language, rendered_feature_names, rendered_threshold, rendered_classes,
+                      node=0, indentation_count=0):
+        """Performs a preorder traversal of the Decision Tree Classifier
+        and writes the result to the self._buf list of chunks. The
+        traversal is done by an emitter generated for the language, see
+        _compile_tree_writer.
         ----------
-        language_dict : dictionary
-            The dictionary containing properties of the desired language.
-        feature_map : dictionary
-            A dictionary that maps the feature names found in the tree
-            to the desired feature names in the exported language.
+        language : _Language
+            The properties of the desired language.
+        rendered_feature_names, rendered_threshold, rendered_classes : list of strings
+            The strings rendered by __render_nodes.
         node : int
-            The current node to evaluate.
+            The node to start the traversal from.
+        indentation_count : int
+            The indentation level of the starting node.
 
         Returns
         -------
         Nothing
         """
-        
-        # if structure
-        self.exported_tree += language_dict['if']
-        self.exported_tree += language_dict['variable_operator']
-        self.exported_tree += language_dict['feature_name_prefix']
-
-        if self.feature_names[self.features[node]] in feature_map:
-            # if the feature name is found in the feature map, use it instead
-            self.exported_tree += feature_map[self.feature_names[self.features[node]]]
-        else:
-            # otherwise, just use the default feature name found in the tree
-            self.exported_tree += self.feature_names[self.features[node]]
 
-        self.exported_tree += language_dict['feature_name_suffix']
-        self.exported_tree += language_dict['condition']
-        self.exported_tree += str(format(self.thresholds[node], language_dict['threshold_formatter']))
-        self.exported_tree += language_dict['then']
-        
-    def __tree_writer(self, language_dict, feature_map, class_map, node=0, indentation_count=0):
-        """Performs a preorder traversal of the Decision Tree Classifier
-        and writes the result to the self.exported_tree string.
+        tree_writer = _compile_tree_writer(language)
+
+        # indentation of every level the traversal can reach, built once instead of per node
+        indents = tuple(language.indentation * i for i in range(indentation_count + self.max_depth + 1))
+
+        # leaves have a negative feature id, clamp it so indexing stays valid (never written)
+        rendered_feature = list(map(rendered_feature_names.__getitem__, np.maximum(self.features, 0).tolist()))
+        rendered_class = list(map(rendered_classes.__getitem__, self._class_ids.tolist()))
+
+        # plain lists index faster than arrays inside the Python loop
+        tree_writer(self._buf, rendered_feature, rendered_threshold, rendered_class,
+                    self.children_left.tolist(), self.children_right.tolist(), indents, node, indentation_count)
+
+    def __numba_tree_writer(self, language, rendered_feature_names, rendered_threshold, rendered_classes):
+        """Performs the same preorder traversal as __tree_writer, but
+        with the numba compiled _emit_tree over the tree's raw arrays.
+        The result is added to the self._buf list of chunks.
         ----------
-        language_dict : dictionary
-            The dictionary containing properties of the desired language.
-        feature_map : dictionary
-            A dictionary that maps the feature names found in the tree
-            to the desired feature names in the exported language.
-        class_map : dictionary
-            A dictionary that maps the class names found in the tree
-            to the desired class names in the exported language.
-        node : int
-            The current node to evaluate.
-        indentation_count : int
-            The current indentation level.
+        language : _Language
+            The properties of the desired language.
+        rendered_feature_names, rendered_threshold, rendered_classes : list of strings
+            The strings rendered by __render_nodes.
 
         Returns
         -------
         Nothing
         """
-        if (node != self.n_nodes):
-            if self.is_leaf[node] == 1:
-                # leaf node
-                self.exported_tree += language_dict['indentation'] * indentation_count
-                self.__writer_leaf(language_dict, class_map, node)
-                
-                return
-            else:
-                # split node
-                self.exported_tree += language_dict['indentation'] * indentation_count
-                self.__writer_split(language_dict, feature_map, node)
-                self.exported_tree += '\n'
-                                  
-            # traverse left down the tree
-            self.__tree_writer(language_dict, feature_map, class_map, self.children_left[node], indentation_count+1)
-            if language_dict['if_end'] != '':
-                self.exported_tree += language_dict['indentation'] * indentation_count
-                self.exported_tree += language_dict['if_end']
-                self.exported_tree += '\n'
-
-            # insert else on return
-            self.exported_tree += language_dict['indentation'] * indentation_count
-            self.exported_tree += language_dict['else']
-            self.exported_tree += '\n'
-            
-            # traverse right down the tree
-            self.__tree_writer(language_dict, feature_map, class_map, self.children_right[node], indentation_count+1)
-            if language_dict['else_end'] != '':
-                self.exported_tree += language_dict['indentation'] * indentation_count
-                self.exported_tree += language_dict['else_end']
-                self.exported_tree += '\n'
-            
+
+        # the pieces every line is made of, see _NUMBA_LANGUAGE_STRINGS
+        language_strings = {
+            'empty': '',
+            'indentation': language.indentation,
+            'split_prefix': language.if_ + language.variable_operator + language.feature_name_prefix,
+            'split_middle': language.feature_name_suffix + language.condition,
+            'split_suffix': language.then,
+            'leaf_prefix': language.result_prefix,
+            'leaf_suffix': language.result_suffix,
+            'if_end': language.if_end,
+            'else_': language.else_,
+            'else_end': language.else_end,
+        }
+
+        # the language strings come first, then the per-node thresholds, the feature names and the classes
+        strings, offsets = _encode_strings(
+            [language_strings[key] for key in _NUMBA_LANGUAGE_STRINGS]
+            + rendered_threshold + rendered_feature_names + rendered_classes
+        )
+
+        # the id of the threshold, feature name and class string of every node
+        threshold_base = len(_NUMBA_LANGUAGE_STRINGS)
+        feature_base = threshold_base + self.n_nodes
+        class_base = feature_base + len(rendered_feature_names)
+        threshold_string = np.arange(threshold_base, feature_base, dtype=np.int64)
+        feature_string = feature_base + np.maximum(self.features, 0).astype(np.int64)
+        class_string = class_base + self._class_ids.astype(np.int64)
+
+        emit_tree = _get_emit_tree_jit()
+        args = (self.children_left, self.children_right, self.max_depth, feature_string, threshold_string,
+                class_string, strings, offsets)
+
+        # first pass sizes the output, second pass fills it
+        size = emit_tree(*args, np.empty(0, dtype=np.uint8), False)
+        out = np.empty(size, dtype=np.uint8)
+        emit_tree(*args, out, True)
+
+        # decoded straight from the array's buffer, without an intermediate bytes copy
+        self._buf.append(str(out.data, 'utf-8'))
+
+    def __as_forest(self):
+        """Wraps the Decision Tree Classifier in a single tree Random
+        Forest Classifier, as treelite and FIL only import ensembles.
+        ----------
+
+        Returns
+        -------
+        forest : RandomForestClassifier
+             A fitted forest whose only estimator is the classifier.
+        """
+
+        # imported here, sklearn.ensemble is only needed for these exports
+        from sklearn.ensemble import RandomForestClassifier
+
+        forest = RandomForestClassifier(n_estimators=1)
+        forest.estimators_ = [self._sklearn_tree]
+        forest.classes_ = self._sklearn_tree.classes_
+        forest.n_classes_ = self._sklearn_tree.n_classes_
+        forest.n_outputs_ = self._sklearn_tree.n_outputs_
+        forest.n_features_in_ = self._sklearn_tree.n_features_in_
+
+        return forest
+
+    def __native_writer(self, output_file_name=''):
+        """Compiles the Decision Tree Classifier to native code with
+        treelite, instead of writing it as source code.
+        ----------
+        output_file_name : string, optional
+            The file name to which the compiled shared library will be
+            exported to. If a file name is not specified, the model is
+            only imported into treelite.
+
+        Returns
+        -------
+        tl_model : treelite.Model
+             The classifier imported into treelite.
+        """
+
+        try:
+            import treelite
+        except ImportError as e:
+            raise ImportError('treelite is required to export to native code.') from e
+
+        tl_model = treelite.sklearn.import_model(self.__as_forest())
+
+        if output_file_name != '':
+            # file specified, compile the model into a shared library
+            try:
+                import tl2cgen
+            except ImportError as e:
+                raise ImportError('tl2cgen is required to compile native code to a file.') from e
+
+            tl2cgen.export_lib(tl_model, toolchain='gcc', libpath=output_file_name,
+                               params={'parallel_comp': os.cpu_count() or 1})
+
+        return tl_model
+
+    def __fil_writer(self):
+        """Loads the Decision Tree Classifier into cuML's Forest
+        Inference Library for inference on the GPU.
+        ----------
+
+        Returns
+        -------
+        fil_model : cuml.ForestInference
+             The classifier loaded into the Forest Inference Library.
+        """
+
+        try:
+            from cuml import ForestInference
+        except ImportError as e:
+            raise ImportError('cuml is required to export to fil.') from e
+
+        # is_classifier replaced the legacy output_class keyword in cuML 25.04
+        return ForestInference.load_from_sklearn(self.__as_forest(), is_classifier=True)
+
     def __get_language_dict(self, language):
         """Retrieve language properties from presets of languages found
         in language_dicts.dat.
@@ -214,34 +687,21 @@ class TreeExporter():
         language_dict : dictionary
              The dictionary containing properties of the desired language.
         """
-        
-        language_dict = {}
-        
-        # reading the data from the file
-        stream = pkg_resources.resource_filename('johnny_appleseed', 'data/language_dicts.dat')
-
-        with open(stream) as f:
-            data = f.read()
-
-        # reconstructing the data as a dictionary of dictionaries
-        language_dicts = json.loads(data)
 
-        # finding only the dictionary of the language we want
-        for l in language_dicts['languages']:
-            if l['name'] == language:
-                language_dict = l['properties']
-            
-        # language not found
-        return language_dict
+        # presets are parsed once and shared, so they must not be modified
+        return _get_language_dict(language)
 
-    def export(self, language, feature_map={}, class_map={}, output_file_name=''):
+    def export(self, language, feature_map={}, class_map={}, output_file_name='', use_numba=False,
+               return_string=True):
         """Export the Decision Tree Classifier to the language of choice.
         ----------
         language : string or dictionary
             The language that the Decision Tree Classifier will be
             exported to. If string, some presets are given in language_dicts.dat,
             otherwise the user will define the details of their language
-            with a dictionary.
+            with a dictionary. 'native' compiles the tree with treelite
+            instead, and 'fil' loads it into cuML's Forest Inference
+            Library for GPU inference.
         feature_map : dictionary, optional
             A dictionary that maps the feature names found in the tree
             to the desired feature names in the exported language.
@@ -253,14 +713,37 @@ class TreeExporter():
             If the file doesn't exist already, it will be created. If the
             file already exists, it will be overwritten. If a file name
             is not specified, the tree will not be exported to a file.
+        use_numba : bool, optional
+            If True, the tree traversal is compiled with numba. If numba
+            is not installed, a warning is raised and the pure Python
+            writer is used instead.
+        return_string : bool, optional
+            If False, the tree is only written to output_file_name and is
+            never joined into a single string, and an empty string is
+            returned. output_file_name must be given in this case.
 
         Returns
         -------
         self.exported_tree : string
-             The exported tree stored as a string.
+             The exported tree stored as a string. For 'native', the
+             treelite model is returned instead (the shared library is
+             written to output_file_name), and for 'fil', the
+             cuml.ForestInference model.
         """
 
-        if type(language) == str:
+        if not return_string and output_file_name == '':
+            # nothing would be returned or written
+            raise ValueError('return_string=False requires an output_file_name.')
+
+        if language == 'native':
+            # compiling to native code, no source is written
+            self.exported_tree = ''
+            return self.__native_writer(output_file_name)
+        elif language == 'fil':
+            # loading into the Forest Inference Library, no source is written
+            self.exported_tree = ''
+            return self.__fil_writer()
+        elif type(language) == str:
             # using a preset language
             language_dict = self.__get_language_dict(language)
             
@@ -270,12 +753,12 @@ class TreeExporter():
             else:
                 # inputted language is a string and is found in the language presets
                 self.exported_tree = ''
-                self.__writer(language_dict, feature_map, class_map, output_file_name)
+                self.__writer(language_dict, feature_map, class_map, output_file_name, use_numba, return_string)
                 return self.exported_tree
         elif type(language) == dict:
             # using a custom language dictionary
             self.exported_tree = ''
-            self.__writer(language, feature_map, class_map, output_file_name)
+            self.__writer(language, feature_map, class_map, output_file_name, use_numba, return_string)
             return self.exported_tree
         else:
             # unknown input type (not string or dictionary)
@@ -291,16 +774,7 @@ class TreeExporter():
              The languages that have presets available.
         """
 
-        # reading the data from the file
-        stream = pkg_resources.resource_filename('johnny_appleseed', 'data/language_dicts.dat')
-
-        with open(stream) as f:
-            data = f.read()
-
-        # reconstructing the data as a dictionary of dictionaries
-        language_dicts = json.loads(data)
-        
-        return [language_dict['name'] for language_dict in language_dicts['languages']]
+        return [language_dict['name'] for language_dict in _load_language_dicts()['languages']]
     
     def get_language_preset(self, language):
         """Get the preset properties from a desired language.
@@ -324,7 +798,8 @@ class TreeExporter():
                 # inputted language is string, but string is not found in language presets
                 raise ValueError('language preset \'' + language + '\' not found.')
                 
-            return language_dict
+            # copy so the caller can't alter the cached preset
+            return dict(language_dict)
         else:
             # unknown input type (not string or dictionary)
             raise TypeError(str(language) + ' is an invalid language input.')
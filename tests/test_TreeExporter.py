@@ -0,0 +1,258 @@
+import sys
+import types
+import warnings
+
+import numpy as np
+import pytest
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from johnny_appleseed import TreeExporter
+
+FEATURE_MAP = {
+    0: 'sepalLength',
+    1: 'sepalWidth',
+    2: 'petalLength',
+    3: 'petalWidth'
+}
+
+
+@pytest.fixture
+def exporter():
+    X, y = load_iris(return_X_y=True)
+    clf = DecisionTreeClassifier(max_depth=4, random_state=0).fit(X, y)
+
+    with warnings.catch_warnings():
+        # the tree is fitted without feature names
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return TreeExporter(clf)
+
+
+def test_export_to_file(exporter, tmp_path):
+    output_file = tmp_path / 'output.txt'
+    exported_tree = exporter.export('C', feature_map=FEATURE_MAP, output_file_name=str(output_file))
+
+    assert output_file.read_text() == exported_tree
+
+
+def test_export_to_file_without_string(exporter, tmp_path):
+    expected = exporter.export('C', feature_map=FEATURE_MAP)
+
+    output_file = tmp_path / 'output.txt'
+    exported_tree = exporter.export('C', feature_map=FEATURE_MAP, output_file_name=str(output_file),
+                                    return_string=False)
+
+    assert exported_tree == ''
+    assert exporter.exported_tree == ''
+    assert output_file.read_text() == expected
+
+
+def test_export_without_string_or_file(exporter):
+    with pytest.raises(ValueError):
+        exporter.export('C', feature_map=FEATURE_MAP, return_string=False)
+
+
+def test_export_with_numba(exporter):
+    pytest.importorskip('numba')
+
+    for language in exporter.get_languages():
+        expected = exporter.export(language, feature_map=FEATURE_MAP, class_map={0: 'Sétosa'})
+        assert exporter.export(language, feature_map=FEATURE_MAP, class_map={0: 'Sétosa'}, use_numba=True) == expected
+
+
+def test_export_with_numba_missing(exporter, monkeypatch):
+    tree_exporter_module = sys.modules[TreeExporter.__module__]
+    monkeypatch.setattr(tree_exporter_module, '_get_emit_tree_jit', lambda: None)
+
+    expected = exporter.export('C', feature_map=FEATURE_MAP)
+
+    with pytest.warns(RuntimeWarning):
+        assert exporter.export('C', feature_map=FEATURE_MAP, use_numba=True) == expected
+
+
+@pytest.mark.parametrize('n_classes', [2, 3])
+def test_export_native(n_classes):
+    treelite = pytest.importorskip('treelite')
+
+    X, y = load_iris(return_X_y=True)
+    y = y if n_classes == 3 else (y > 0).astype(int)
+    clf = DecisionTreeClassifier(max_depth=4, random_state=0).fit(X, y)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        tl_model = TreeExporter(clf).export('native')
+
+    probabilities = treelite.gtil.predict(tl_model, X).reshape(len(X), -1)
+    np.testing.assert_allclose(probabilities, clf.predict_proba(X))
+
+
+def test_export_native_to_file(exporter, tmp_path):
+    pytest.importorskip('treelite')
+    pytest.importorskip('tl2cgen')
+
+    output_file = tmp_path / 'model.so'
+    exporter.export('native', output_file_name=str(output_file))
+
+    assert output_file.stat().st_size > 0
+
+
+def test_failed_export_keeps_output_file(exporter, tmp_path):
+    output_file = tmp_path / 'output.txt'
+    output_file.write_text('PRECIOUS')
+
+    # the tree was fitted without feature names, so unmapped features are numbers
+    with pytest.raises(TypeError, match='feature 0'):
+        exporter.export('C', output_file_name=str(output_file))
+
+    assert output_file.read_text() == 'PRECIOUS'
+
+
+def test_failed_language_keeps_output_file(exporter, tmp_path):
+    output_file = tmp_path / 'output.txt'
+    output_file.write_text('PRECIOUS')
+
+    language = exporter.get_language_preset('C')
+    language['else'] = None
+
+    with pytest.raises(TypeError, match='else'):
+        exporter.export(language, feature_map=FEATURE_MAP, output_file_name=str(output_file))
+
+    assert output_file.read_text() == 'PRECIOUS'
+
+
+@pytest.fixture
+def small_exporter():
+    # x <= 0.5 splits off class 0, then x <= 1.5 and y <= 0.5 separate classes 1 and 2
+    X = np.array([[0, 0], [0, 1], [1, 0], [1, 1], [2, 0], [2, 1]], dtype=float)
+    y = np.array([0, 0, 1, 2, 1, 1])
+    clf = DecisionTreeClassifier(random_state=0).fit(X, y)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return TreeExporter(clf)
+
+
+@pytest.fixture(params=[False, True], ids=['python', 'numba'])
+def use_numba(request):
+    if request.param:
+        pytest.importorskip('numba')
+    return request.param
+
+
+def test_export_golden_c(small_exporter, use_numba):
+    expected = (
+        'if (x <= 0.5000) {\n'
+        '\tprintf("zero");\n'
+        '} else {\n'
+        '\tif (x <= 1.5000) {\n'
+        '\t\tif (y <= 0.5000) {\n'
+        '\t\t\tprintf("one");\n'
+        '\t\t} else {\n'
+        '\t\t\tprintf("two");\n'
+        '\t\t}\n'
+        '\t} else {\n'
+        '\t\tprintf("one");\n'
+        '\t}\n'
+        '}\n'
+    )
+
+    exported_tree = small_exporter.export('C', feature_map={0: 'x', 1: 'y'},
+                                          class_map={0: 'zero', 1: 'one', 2: 'two'}, use_numba=use_numba)
+
+    assert exported_tree == expected
+
+
+def test_export_golden_placeholders(small_exporter, use_numba):
+    # every property is non-empty in the '.' preset, including if_end and else_end
+    expected = (
+        '_IF__VARIABLE_OPERATOR__FEATURE_NAME_PREFIX_x_FEATURE_NAME_SUFFIX__CONDITION_0.5000_THEN_\n'
+        '_INDENTATION__RESULT_PREFIX_0_RESULT_SUFFIX_\n'
+        '_IFEND_\n'
+        '_ELSE_\n'
+        '_INDENTATION__IF__VARIABLE_OPERATOR__FEATURE_NAME_PREFIX_x_FEATURE_NAME_SUFFIX__CONDITION_1.5000_THEN_\n'
+        '_INDENTATION__INDENTATION__IF__VARIABLE_OPERATOR__FEATURE_NAME_PREFIX_y_FEATURE_NAME_SUFFIX__CONDITION_0.5000_THEN_\n'
+        '_INDENTATION__INDENTATION__INDENTATION__RESULT_PREFIX_1_RESULT_SUFFIX_\n'
+        '_INDENTATION__INDENTATION__IFEND_\n'
+        '_INDENTATION__INDENTATION__ELSE_\n'
+        '_INDENTATION__INDENTATION__INDENTATION__RESULT_PREFIX_2_RESULT_SUFFIX_\n'
+        '_INDENTATION__INDENTATION__ELSEEND_\n'
+        '_INDENTATION__IFEND_\n'
+        '_INDENTATION__ELSE_\n'
+        '_INDENTATION__INDENTATION__RESULT_PREFIX_1_RESULT_SUFFIX_\n'
+        '_INDENTATION__ELSEEND_\n'
+        '_ELSEEND_\n'
+    )
+
+    exported_tree = small_exporter.export('.', feature_map={0: 'x', 1: 'y'}, use_numba=use_numba)
+
+    assert exported_tree == expected
+
+
+def test_export_golden_custom(small_exporter, use_numba):
+    # if_end and else_end are both empty, so those lines are left out
+    language = {
+        'indentation': '  ',
+        'if': 'if the ',
+        'if_end': '',
+        'condition': ' feature is less than or equal to ',
+        'then': ',',
+        'else': 'otherwise,',
+        'else_end': '',
+        'set': ' = ',
+        'variable_operator': '',
+        'feature_name_prefix': '',
+        'feature_name_suffix': '',
+        'result_prefix': 'the sample is ',
+        'result_suffix': '.',
+        'threshold_formatter': '.2f'
+    }
+    expected = (
+        'if the x feature is less than or equal to 0.50,\n'
+        '  the sample is 0.\n'
+        'otherwise,\n'
+        '  if the x feature is less than or equal to 1.50,\n'
+        '    if the y feature is less than or equal to 0.50,\n'
+        '      the sample is 1.\n'
+        '    otherwise,\n'
+        '      the sample is 2.\n'
+        '  otherwise,\n'
+        '    the sample is 1.\n'
+    )
+
+    exported_tree = small_exporter.export(language, feature_map={0: 'x', 1: 'y'}, use_numba=use_numba)
+
+    assert exported_tree == expected
+
+
+def test_export_fil(exporter, monkeypatch):
+    calls = []
+
+    class ForestInference:
+        @staticmethod
+        def load_from_sklearn(model, **kwargs):
+            calls.append((model, kwargs))
+            return 'fil model'
+
+    # a stand-in for cuml, which needs a GPU
+    cuml = types.ModuleType('cuml')
+    cuml.ForestInference = ForestInference
+    monkeypatch.setitem(sys.modules, 'cuml', cuml)
+
+    assert exporter.export('fil') == 'fil model'
+
+    (forest, kwargs), = calls
+    assert kwargs == {'is_classifier': True}
+    assert isinstance(forest, RandomForestClassifier)
+    assert forest.estimators_ == [exporter._sklearn_tree]
+    np.testing.assert_array_equal(forest.classes_, exporter._sklearn_tree.classes_)
+    assert forest.n_classes_ == exporter._sklearn_tree.n_classes_
+    assert forest.n_outputs_ == 1
+    assert forest.n_features_in_ == 4
+
+
+def test_export_fil_missing(exporter, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'cuml', None)
+
+    with pytest.raises(ImportError):
+        exporter.export('fil')